@@ -2,15 +2,45 @@ import os
 import webbrowser
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import plotly.io as pio
 from datetime import datetime
 import pytz
 import numpy as np
+from density import category_densities
+from leaderboard import CategoryLeaderboard
 
 # Load datasets (update paths if needed)
 apps_df = pd.read_csv("googleplaystore.csv")
 reviews_df = pd.read_csv("googleplaystore_user_reviews.csv")
-file_path = "googleplaystore.csv"  # Update with the correct path
+
+# Static previews shown on the dashboard before any interactive chart is opened
+THUMBNAIL_DIR = "thumbnails"
+
+def thumbnail_path(filename):
+    return os.path.join(THUMBNAIL_DIR, filename.replace(".html", ".png"))
+
+def thumbnails_available():
+    # Rendering PNGs needs kaleido (and Chrome for kaleido v1). Probe it once so a missing
+    # renderer is reported a single time instead of failing on every chart.
+    try:
+        go.Figure().to_image(format="png", width=10, height=10)
+        return True
+    except Exception as e:
+        print(f"Static thumbnails disabled, the dashboard will show plain buttons: {type(e).__name__}: {e}")
+        return False
+
+THUMBNAILS_ENABLED = thumbnails_available()
+
+def save_chart(fig, filename):
+    fig.write_html(filename)
+    if not THUMBNAILS_ENABLED:
+        return
+    try:
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        fig.write_image(thumbnail_path(filename), width=640, height=400)
+    except Exception as e:
+        print(f"Skipping thumbnail for {filename}: {type(e).__name__}: {e}")
 
 # Convert Last Updated column to datetime
 apps_df["Last Updated"] = pd.to_datetime(apps_df["Last Updated"], errors='coerce')
@@ -21,6 +51,13 @@ apps_df["Installs"] = pd.to_numeric(apps_df["Installs"].str.replace(r'[,\+]', ''
 # Convert "Reviews" column to numeric
 apps_df["Reviews"] = pd.to_numeric(apps_df["Reviews"], errors='coerce')
 
+# Per-category counts, install sums, review sums and mean ratings for the "top N categories"
+# charts below, built once from the same rows the other charts use. Every row counts, as
+# with value_counts(), so apps listed several times count several times. The snapshot
+# store's leaderboard keeps one row per app and describes the latest snapshot rather
+# than this file, so it is not used here.
+leaderboard = CategoryLeaderboard.from_apps(apps_df)
+
 # Merge datasets on 'App' column
 merged_df = pd.merge(apps_df, reviews_df, on='App')
 
@@ -57,7 +94,7 @@ fig1 = px.bar(
     title='Sentiment Distribution by Rating Group for Top 5 App Categories',
     barmode='stack'
 )
-fig1.write_html("app_rating_distribution.html")
+save_chart(fig1, "app_rating_distribution.html")
 
 # Time-based access control function
 ist = pytz.timezone('Asia/Kolkata')
@@ -70,23 +107,19 @@ def is_time_allowed(start, end):
 for filename in ["top_categories.html", "global_installs.html", "filtered_apps.html", "app_size_vs_rating.html", "rating_category_counts.html", "app_reviews_distribution.html", "installs_vs_reviews.html", "app_category_trend.html", "app_sentiment_distribution.html"]:
     if os.path.exists(filename):
         os.remove(filename)
+    if os.path.exists(thumbnail_path(filename)):
+        os.remove(thumbnail_path(filename))
 
 # Task 2: Available 3 PM – 5 PM IST
 if is_time_allowed(datetime.strptime("15:00", "%H:%M").time(), datetime.strptime("17:00", "%H:%M").time()):
-    category_counts = apps_df['Category'].value_counts().nlargest(10)
+    category_counts = leaderboard.top(10, by='count')
     fig2 = px.bar(category_counts, x=category_counts.index, y=category_counts.values, title='Top 10 Categories by Number of Apps', labels={'x': 'Category', 'y': 'Number of Apps'})
-    fig2.write_html("top_categories.html")
+    save_chart(fig2, "top_categories.html")
 
 # Task 3: Available 6 PM – 8 PM IST
 # Task 3: Available 6 PM – 8 PM IST (without 'Country')
 if is_time_allowed(datetime.strptime("18:00", "%H:%M").time(), datetime.strptime("20:00", "%H:%M").time()):
-    df = pd.read_csv(file_path)
-    df = df[['Category', 'Installs']].dropna()
-    df['Installs'] = df['Installs'].astype(str).str.replace(r'[^\d]', '', regex=True)
-    df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce').fillna(0).astype(int)
-    top_categories = df.groupby('Category')['Installs'].sum().nlargest(5).index
-    df = df[df['Category'].isin(top_categories)]
-    category_installs = df.groupby('Category')['Installs'].sum().reset_index()
+    category_installs = leaderboard.top(5, by='installs').rename('Installs').reset_index()
     fig3 = px.bar(
         category_installs,
         x='Category',
@@ -95,7 +128,7 @@ if is_time_allowed(datetime.strptime("18:00", "%H:%M").time(), datetime.strptime
         title="Top Categories by Global Installs (Filtered)",
         labels={'Installs': 'Total Installs'}
     )
-    fig3.write_html("global_installs.html")
+    save_chart(fig3, "global_installs.html")
 
 # Task 4: Available 4 PM – 6 PM IST
 if is_time_allowed(datetime.strptime("16:00", "%H:%M").time(), datetime.strptime("18:00", "%H:%M").time()):
@@ -103,39 +136,92 @@ if is_time_allowed(datetime.strptime("16:00", "%H:%M").time(), datetime.strptime
     category_counts = filtered_df['Category'].value_counts()
     valid_categories = category_counts[category_counts > 50].index
     filtered_df = filtered_df[filtered_df['Category'].isin(valid_categories)]
-    fig4 = px.violin(filtered_df, x='Category', y='Rating', box=True, points='all', title='Distribution of Ratings for Each App Category', color='Category')
-    fig4.write_html("filtered_apps.html")
+    # Precompute KDE curves and box stats so the page only carries summaries, not every rating
+    violin_stats = category_densities(filtered_df, 'Category', 'Rating')
+    fig4 = go.Figure()
+    palette = px.colors.qualitative.Plotly
+    for i, row in violin_stats.iterrows():
+        color = palette[i % len(palette)]
+        half_width = 0.4 * row['density'] / max(row['density'].max(), 1e-12)
+        fig4.add_trace(go.Scatter(
+            x=np.concatenate([i - half_width, (i + half_width)[::-1]]),
+            y=np.concatenate([row['grid'], row['grid'][::-1]]),
+            fill='toself', mode='lines', line=dict(color=color, width=1),
+            name=row['Category'], legendgroup=row['Category'], hoverinfo='name'
+        ))
+        fig4.add_trace(go.Box(
+            x=[i], q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lower_whisker']], upperfence=[row['upper_whisker']],
+            width=0.08, marker_color=color, legendgroup=row['Category'], showlegend=False
+        ))
+        if row['outliers']:
+            fig4.add_trace(go.Scatter(
+                x=[i] * len(row['outliers']), y=row['outliers'], mode='markers',
+                marker=dict(color=color, size=4), legendgroup=row['Category'], showlegend=False
+            ))
+    fig4.update_layout(
+        title='Distribution of Ratings for Each App Category',
+        xaxis=dict(title='Category', tickmode='array', tickvals=list(range(len(violin_stats))), ticktext=list(violin_stats['Category'])),
+        yaxis_title='Rating'
+    )
+    save_chart(fig4, "filtered_apps.html")
 
 # Task 5: Available 5 PM – 7 PM IST
 if is_time_allowed(datetime.strptime("17:00", "%H:%M").time(), datetime.strptime("19:00", "%H:%M").time()):
     fig5 = px.scatter(filtered_df, x="Installs", y="Rating", size="Installs", color="Category", hover_name="App", title="App Installs vs. Average Rating")
-    fig5.write_html("app_size_vs_rating.html")
+    save_chart(fig5, "app_size_vs_rating.html")
 
 # Task 6: Available 9 AM – 11 AM IST
 if is_time_allowed(datetime.strptime("09:00", "%H:%M").time(), datetime.strptime("11:00", "%H:%M").time()):
     rating_category_counts = apps_df.groupby(['Category', 'Rating']).size().reset_index(name='Count')
     fig6 = px.bar(rating_category_counts, x='Rating', y='Count', color='Category', title='App Ratings Distribution by Category')
-    fig6.write_html("rating_category_counts.html")
+    save_chart(fig6, "rating_category_counts.html")
 
 # Task 7: Available 10 AM – 12 PM IST
 if is_time_allowed(datetime.strptime("10:00", "%H:%M").time(), datetime.strptime("12:00", "%H:%M").time()):
     app_reviews_distribution = apps_df[['App', 'Reviews']].dropna()
     fig7 = px.histogram(app_reviews_distribution, x='Reviews', title='Distribution of Reviews for Apps')
-    fig7.write_html("app_reviews_distribution.html")
+    save_chart(fig7, "app_reviews_distribution.html")
 
 # Task 8: Available 11 AM – 1 PM IST
 if is_time_allowed(datetime.strptime("11:00", "%H:%M").time(), datetime.strptime("13:00", "%H:%M").time()):
     installs_vs_reviews = apps_df[['Installs', 'Reviews']].dropna()
     fig8 = px.scatter(installs_vs_reviews, x='Installs', y='Reviews', title='Installs vs Reviews for Apps')
-    fig8.write_html("installs_vs_reviews.html")
+    save_chart(fig8, "installs_vs_reviews.html")
 
 # Task 9: Available 12 PM – 2 PM IST
 if is_time_allowed(datetime.strptime("12:00", "%H:%M").time(), datetime.strptime("14:00", "%H:%M").time()):
     app_category_trend = apps_df.groupby(['Last Updated', 'Category']).size().reset_index(name='App Count')
     fig9 = px.line(app_category_trend, x='Last Updated', y='App Count', color='Category', title='App Category Trend Over Time')
-    fig9.write_html("app_category_trend.html")
+    save_chart(fig9, "app_category_trend.html")
+
+# Dashboard cards: chart file, label, button style and time window
+charts = [
+    ("app_rating_distribution.html", "Sentiment Distribution", "sentiment-btn", "00", "24"),
+    ("top_categories.html", "Top Categories", "categories-btn", "15", "17"),
+    ("global_installs.html", "Global Installs", "installs-btn", "18", "20"),
+    ("filtered_apps.html", "Filtered Apps", "filtered-btn", "16", "18"),
+    ("app_size_vs_rating.html", "App Size vs Rating", "size-rating-btn", "17", "19"),
+    ("rating_category_counts.html", "Rating by Category", "rating-category-btn", "09", "11"),
+    ("app_reviews_distribution.html", "App Reviews Distribution", "reviews-btn", "10", "12"),
+    ("installs_vs_reviews.html", "Installs vs Reviews", "installs-reviews-btn", "11", "13"),
+    ("app_category_trend.html", "App Category Trend", "trend-btn", "12", "14"),
+]
 
-# Generate dashboard with buttons
+# Each card shows the static preview when one was rendered; the interactive page is only
+# loaded when the card is clicked
+chart_cards = ""
+for filename, label, css_class, start, end in charts:
+    preview = ""
+    if os.path.exists(thumbnail_path(filename)):
+        preview = f"<img src='{thumbnail_path(filename).replace(os.sep, '/')}' alt='{label}' width='320' height='200'>"
+    chart_cards += f"""
+        <div class="chart-card" onclick="openPlot('{filename}', {start}, {end})">
+            {preview}
+            <button class="{css_class}">{label}</button>
+        </div>"""
+
+# Generate dashboard with chart previews
 html_content = """
 <!DOCTYPE html>
 <html>
@@ -148,6 +234,26 @@ html_content = """
             color: white;
             text-align: center;
             font-family: Arial, sans-serif;
+        }
+        .chart-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(340px, 1fr));
+            gap: 16px;
+            padding: 16px;
+        }
+        .chart-card {
+            background-color: rgba(0, 0, 0, 0.6);
+            border-radius: 8px;
+            padding: 10px;
+            cursor: pointer;
+        }
+        .chart-card img {
+            display: block;
+            width: 100%;
+            height: auto;
+            background-color: white;
+            border-radius: 4px;
+        }
         button {
             margin: 10px;
             padding: 12px 24px;
@@ -208,19 +314,13 @@ html_content = """
 <body style='background-color: black; color: white; text-align: center;'>
     <h1><img src='https://tse4.mm.bing.net/th?id=OIP.aK0pFHbj6X0jqS0ZGmqGmAHaEK&pid=Api&P=0&h=180' alt='Google Play Store Logo' width='50' style='vertical-align: middle;'> Google Play Store Data Analytics</h1>
     
-    <!-- Each button has its own time window and color -->
-    <button class="sentiment-btn" onclick="openPlot('app_rating_distribution.html', 00, 24)">Sentiment Distribution </button>
-    <button class="categories-btn" onclick="openPlot('top_categories.html', 15, 17)">Top Categories </button>
-    <button class="installs-btn" onclick="openPlot('global_installs.html', 18, 20)">Global Installs </button>
-    <button class="filtered-btn" onclick="openPlot('filtered_apps.html', 16, 18)">Filtered Apps </button>
-    <button class="size-rating-btn" onclick="openPlot('app_size_vs_rating.html', 17, 19)">App Size vs Rating </button>
-    <button class="rating-category-btn" onclick="openPlot('rating_category_counts.html', 09, 11)">Rating by Category</button>
-    <button class="reviews-btn" onclick="openPlot('app_reviews_distribution.html', 10, 12)">App Reviews Distribution</button>
-    <button class="installs-reviews-btn" onclick="openPlot('installs_vs_reviews.html', 11, 13)">Installs vs Reviews</button>
-    <button class="trend-btn" onclick="openPlot('app_category_trend.html', 12, 14)">App Category Trend</button>
+    <!-- Each card has its own time window and color -->
+    <div class="chart-grid">CHART_CARDS
+    </div>
 </body>
 </html>
 """
+html_content = html_content.replace("CHART_CARDS", chart_cards)
 with open("dashboard.html", "w", encoding="utf-8") as f:
     f.write(html_content)
 
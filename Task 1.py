@@ -1,35 +1,11 @@
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
+import os
+from review_index import ReviewIndex, INDEX_DIR
+from pipeline import engine_from_args, run_task
 
-# Load your dataset
-df = pd.read_csv('googleplaystore_user_reviews.csv')
-
-# Clean column names
-df.columns = df.columns.str.strip()
-
-# Filter rows with valid sentiment
-df = df.dropna(subset=['Sentiment'])
-
-# Simulate sentiment labels if needed (e.g., for some analysis)
-# If sentiment is already in 'Sentiment' column, you can skip this part
-
-# For example, if you want to group by 'Positive', 'Neutral', 'Negative':
-# df['Sentiment'] = np.random.choice(['Positive', 'Neutral', 'Negative'], size=len(df))
-
-# For example, if you're working with 'Sentiment_Polarity' to classify reviews:
-# You can classify based on polarity
-df['Sentiment'] = df['Sentiment_Polarity'].apply(lambda x: 'Positive' if x > 0 else ('Negative' if x < 0 else 'Neutral'))
-
-# Filter out rows with missing sentiment labels
-df = df.dropna(subset=['Sentiment'])
-
-# Top 5 app categories (If available in the dataset, assuming 'App' column represents app names)
-# You can adjust based on the actual categories in your dataset
-top_categories = df['App'].value_counts().nlargest(5).index
-
-# Group by the app and sentiment
-sentiment_counts = df[df['App'].isin(top_categories)].groupby(['App', 'Sentiment']).size().unstack().fillna(0)
+# Sentiment counts for the top 5 apps, computed on the selected engine (see pipeline.py)
+ENGINE = engine_from_args()
+sentiment_counts = run_task('task1', ENGINE).pivot(index='App', columns='Sentiment', values='Count').fillna(0)
 
 # Plot stacked bar chart for sentiment distribution by app
 ax = sentiment_counts.plot(kind='bar', stacked=True, colormap='Set3')
@@ -47,3 +23,12 @@ for p in ax.patches:
 
 plt.tight_layout()
 plt.show()
+
+# Keyword drilldown for the charted apps, using the review text index built with
+# `python review_index.py build` (skipped if no index has been built yet)
+DRILLDOWN_KEYWORDS = []
+if DRILLDOWN_KEYWORDS and os.path.exists(os.path.join(INDEX_DIR, 'meta.json')):
+    index = ReviewIndex()
+    for app in sentiment_counts.index:
+        print(f"\n{app}")
+        print(index.term_sentiment(DRILLDOWN_KEYWORDS, app=app).to_string(index=False))
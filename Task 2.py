@@ -1,37 +1,31 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import numpy as np
+from pipeline import engine_from_args, run_task
+from trendline import fit_ols, predict_band, density_downsample
 
-# Load your dataset
-df = pd.read_csv('googleplaystore.csv')
+# Paid apps with Revenue = Price * Installs, computed on the selected engine (see pipeline.py)
+ENGINE = engine_from_args()
+df_paid = run_task('task2', ENGINE)
 
-# Clean column names
-df.columns = df.columns.str.strip()
+# Trendline options: 'linear' or 'loglog' fit, optionally one line per category
+TRENDLINE_MODE = 'linear'
+PER_CATEGORY_TRENDS = False
 
-# Filter only paid apps with valid numeric data
-df_paid = df[
-    (df['Type'] == 'Paid') & 
-    (df['Installs'].notnull()) & 
-    (df['Category'].notnull()) & 
-    (df['Price'].notnull())
-]
+# Fit the trendline(s) in closed form instead of bootstrapping a confidence band
+use_log = TRENDLINE_MODE == 'loglog'
+overall_fits = fit_ols(df_paid['Installs'], df_paid['Revenue'], log=use_log)
+if PER_CATEGORY_TRENDS:
+    category_fits = fit_ols(df_paid['Installs'], df_paid['Revenue'], groups=df_paid['Category'], log=use_log)
+    category_fits = category_fits[category_fits['n'] >= 3]
 
-# Clean 'Installs' column by removing commas and '+' and converting to numeric
-df_paid['Installs'] = df_paid['Installs'].str.replace(',', '').str.replace('+', '').astype(float)
-
-# Clean 'Price' column by removing the '$' sign and converting to numeric
-df_paid['Price'] = df_paid['Price'].str.replace('$', '').astype(float)
-
-# Calculate 'Revenue' as Price * Installs
-df_paid['Revenue'] = df_paid['Price'] * df_paid['Installs']
-
-# Drop rows where 'Revenue' or 'Installs' are NaN after conversion
-df_paid = df_paid.dropna(subset=['Revenue', 'Installs'])
+# Thin out dense clusters of points before drawing the scatter
+df_plot = density_downsample(df_paid, 'Installs', 'Revenue', log=use_log)
 
 # Plot
 plt.figure(figsize=(12, 6))
 sns.scatterplot(
-    data=df_paid,
+    data=df_plot,
     x='Installs',
     y='Revenue',
     hue='Category',  # Use 'Category' to color the points
@@ -39,15 +33,24 @@ sns.scatterplot(
     alpha=0.7
 )
 
-# Add trendline using seaborn’s regplot (no hue support, so do it separately)
-sns.regplot(
-    data=df_paid,
-    x='Installs',
-    y='Revenue',
-    scatter=False,
-    color='black',
-    line_kws={'linewidth': 2, 'label': 'Trendline'}
-)
+# Evaluate the fits on a grid spanning the installs range (no trendline if nothing could be fitted)
+if not overall_fits.empty:
+    x_min = max(df_paid['Installs'].min(), 1) if use_log else df_paid['Installs'].min()
+    x_max = df_paid['Installs'].max()
+    x_grid = np.geomspace(x_min, x_max, 200) if use_log else np.linspace(x_min, x_max, 200)
+
+    if PER_CATEGORY_TRENDS:
+        for category, fit in category_fits.iterrows():
+            y_fit, _, _ = predict_band(fit, x_grid)
+            plt.plot(x_grid, y_fit, linewidth=1, linestyle='--', label=f'{category} trend')
+
+    y_fit, y_lower, y_upper = predict_band(overall_fits.iloc[0], x_grid)
+    plt.plot(x_grid, y_fit, color='black', linewidth=2, label='Trendline')
+    plt.fill_between(x_grid, y_lower, y_upper, color='black', alpha=0.15)
+
+if use_log:
+    plt.xscale('log')
+    plt.yscale('log')
 
 plt.title('Revenue vs Installs for Paid Apps')
 plt.xlabel('Number of Installs')
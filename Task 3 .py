@@ -1,32 +1,13 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import pytz
+from pipeline import engine_from_args, run_task
 
-# Assuming df is your DataFrame, and it's already loaded with the required columns
-
-# Step 1: Filter the data based on the conditions
-df_filtered = df[
-    (df['Installs'] > 10000) & 
-    ((df['Type'] == 'Paid') & (df['Price'] * df['Installs'] > 10000) | (df['Type'] == 'Free')) & 
-    (df['Android Ver'].astype(str).str.split('.').str[0].astype(float) > 4.0) &  # Ensure 'Android Ver' is treated as a string
-    (df['Size'].astype(str).str.replace('M', '').astype(float) > 15) &  # Ensure 'Size' is treated as a string
-    (df['Content Rating'] == 'Everyone') & 
-    (df['App'].str.len() <= 30)
-]
-
-# Step 2: Get the top 3 app categories by the number of apps
-top_categories = df_filtered['Category'].value_counts().head(3).index
-
-# Filter data to only include these top 3 categories
-df_top3 = df_filtered[df_filtered['Category'].isin(top_categories)]
-
-# Step 3: Calculate Revenue for each app (Price * Installs)
-df_top3['Revenue'] = df_top3['Price'] * df_top3['Installs']
-
-# Step 4: Group by Type (Free vs Paid) and Category, and calculate the mean of Installs and Revenue
-category_stats = df_top3.groupby(['Category', 'Type'])[['Installs', 'Revenue']].mean().reset_index()
+# Steps 1-4: filter the apps, keep the top 3 categories by number of apps and average
+# Installs and Revenue by Category and Type, on the selected engine (see pipeline.py)
+ENGINE = engine_from_args()
+category_stats = run_task('task3', ENGINE)
 
 # Step 5: Check if the current time is between 1 PM and 2 PM IST
 ist = pytz.timezone('Asia/Kolkata')
@@ -4,36 +4,17 @@ from datetime import datetime
 from pytz import timezone
 from IPython.display import display, HTML
 import json
+from pipeline import engine_from_args, run_task
 
-# Load the dataset
+# Total installs per category, excluding categories starting with 'A', 'C', 'G', or 'S',
+# computed on the selected engine (see pipeline.py)
+ENGINE = engine_from_args()
 try:
-    df = pd.read_csv('googleplaystore.csv')
+    category_installs = run_task('task5', ENGINE).set_index('Category')['Installs']
 except FileNotFoundError:
     display(HTML("<p style='color:red;'>Error: The file 'googleplaystore.csv' was not found. Please make sure the file is in the same directory as your Jupyter Notebook or provide the correct path.</p>"))
     exit()
 
-# Data Cleaning and Preparation
-# Convert 'Installs' to numeric
-def clean_installs(installs):
-    if isinstance(installs, str):
-        cleaned_str = ''.join(filter(str.isdigit, installs))
-        if cleaned_str:
-            return int(cleaned_str)
-        else:
-            return 0  # Or another appropriate default value
-    return installs
-
-df['Installs'] = df['Installs'].apply(clean_installs)
-
-# Filter out rows where 'Installs' is NaN after cleaning (if any)
-df = df.dropna(subset=['Installs'])
-
-# Filter out categories starting with 'A', 'C', 'G', or 'S'
-filtered_df = df[~df['Category'].str.startswith(('A', 'C', 'G', 'S'), na=False)].copy()
-
-# Calculate total installs per category in the filtered data
-category_installs = filtered_df.groupby('Category')['Installs'].sum()
-
 # Get the top 5 categories that are also present in the inner dictionaries of country_data
 country_data = {
     'USA': {'PRODUCTIVITY': 1500000, 'TOOLS': 1200000, 'FAMILY': 2000000, 'PHOTOGRAPHY': 1100000, 'NEWS_AND_MAGAZINES': 900000, 'Education': 600000, 'Entertainment': 1500000, 'Health & Fitness': 1100000, 'Finance': 700000},
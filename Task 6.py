@@ -1,46 +1,31 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from density import category_densities
 from datetime import datetime
+from pipeline import engine_from_args, run_task
 
-# Load the dataset (assuming the file is named 'googleplaystore.csv')
-df = pd.read_csv('googleplaystore.csv')
-
-# Function to convert 'Reviews' column
-def convert_reviews(value):
-    if isinstance(value, str):
-        if 'M' in value:
-            return float(value.replace('M', '')) * 1e6  # Convert millions to integer
-        elif 'K' in value:
-            return float(value.replace('K', '')) * 1e3  # Convert thousands to integer
-    return float(value)  # For other cases, convert directly to float
-
-# Apply the conversion function to the 'Reviews' column
-df['Reviews'] = df['Reviews'].apply(convert_reviews)
-
-# Data Preprocessing
-# Filter out apps whose name contains 'C', reviews >= 10, and rating < 4.0
-filtered_df = df[df['App'].str.contains('C', case=False, na=False)]
-filtered_df = filtered_df[(filtered_df['Reviews'] >= 10)]
-filtered_df = filtered_df[(filtered_df['Rating'] < 4.0)]
-
-# Remove rows with missing or invalid category information
-filtered_df = filtered_df.dropna(subset=['Category'])
-
-# Count the number of apps in each category and filter categories with more than 50 apps
-category_counts = filtered_df['Category'].value_counts()
-valid_categories = category_counts[category_counts > 50].index
-
-# Filter the dataset to only include valid categories
-filtered_df = filtered_df[filtered_df['Category'].isin(valid_categories)]
+# Apps with 'C' in the name, reviews >= 10 and rating < 4.0, in categories with more
+# than 50 such apps, computed on the selected engine (see pipeline.py)
+ENGINE = engine_from_args()
+filtered_df = run_task('task6', ENGINE)
 
 # Time Restriction: Check if it's between 4 PM and 6 PM IST
 current_time = datetime.now()
 if current_time.hour >= 16 and current_time.hour < 18:
     # Create the violin plot
     plt.figure(figsize=(12, 6))
-    sns.violinplot(x='Category', y='Rating', data=filtered_df)
-    plt.xticks(rotation=90)  # Rotate category labels for better readability
+    # Draw violins from the precomputed KDE curves and box stats
+    violin_stats = category_densities(filtered_df, 'Category', 'Rating')
+    palette = sns.color_palette(n_colors=len(violin_stats))
+    for i, row in violin_stats.iterrows():
+        half_width = 0.4 * row['density'] / max(row['density'].max(), 1e-12)
+        plt.fill_betweenx(row['grid'], i - half_width, i + half_width, color=palette[i], edgecolor='gray')
+        plt.vlines(i, row['lower_whisker'], row['upper_whisker'], color='dimgray', linewidth=1.5)
+        plt.vlines(i, row['q1'], row['q3'], color='dimgray', linewidth=5)
+        plt.scatter([i], [row['median']], color='white', s=15, zorder=3)
+    plt.xticks(range(len(violin_stats)), violin_stats['Category'], rotation=90)  # Rotate category labels for better readability
+    plt.xlabel('Category')
+    plt.ylabel('Rating')
     plt.title('Distribution of Ratings for Each App Category (Rating < 4.0, Apps with "C" in Name)')
     plt.show()
 else:
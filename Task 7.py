@@ -1,32 +1,21 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from datetime import datetime
+from snapshot_store import list_snapshots, partition_path
+from pipeline import engine_from_args, run_task
+
+# Use the latest snapshot from the history store if one exists, otherwise the raw CSV.
+# With a snapshot, "updated in the last year" is measured from the snapshot date.
+snapshot_dates = list_snapshots('apps')
+if snapshot_dates:
+    sources = {'apps': partition_path('apps', snapshot_dates[-1])}
+    reference_date = snapshot_dates[-1]
+else:
+    sources, reference_date = None, None
 
-# Load the dataset (assuming the file is named 'googleplaystore.csv')
-df = pd.read_csv('googleplaystore.csv')
-
-# Clean 'Last Updated' column: Try to convert it to datetime, invalid values will be set to NaT
-df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
-
-# Filter out rows where 'Last Updated' is NaT
-df = df.dropna(subset=['Last Updated'])
-
-# Get the current date and filter apps that have been updated in the last year
-current_date = pd.to_datetime('today')
-one_year_ago = current_date - pd.DateOffset(years=1)
-df = df[df['Last Updated'] > one_year_ago]
-
-# Convert 'Reviews' and 'Installs' columns to numeric, removing commas and '+' signs
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
-df['Installs'] = df['Installs'].str.replace(',', '').str.replace('+', '').astype(int)
-
-# Filter apps with at least 100,000 installs and more than 1,000 reviews
-filtered_df = df[(df['Installs'] >= 100000) & (df['Reviews'] > 1000)]
-
-# Exclude genres starting with certain letters
-excluded_genres = ['A', 'F', 'E', 'G', 'I', 'K']
-filtered_df = filtered_df[~filtered_df['Category'].str.startswith(tuple(excluded_genres))]
+# Apps updated in the last year with at least 100,000 installs and more than 1,000 reviews,
+# excluding genres starting with A, F, E, G, I or K, on the selected engine (see pipeline.py)
+filtered_df = run_task('task7', engine_from_args(), sources=sources, reference_date=reference_date)
 
 # Time Restriction: Check if it's between 2 PM and 4 PM IST
 current_time = datetime.now()
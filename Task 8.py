@@ -1,38 +1,32 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
-
-# Load the dataset (assuming the file is named 'googleplaystore.csv')
-df = pd.read_csv('googleplaystore.csv')
-
-# Clean up 'Reviews' and 'Installs' columns
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
-
-# Remove non-numeric values like 'Free' in the 'Installs' column
-df['Installs'] = df['Installs'].replace('Free', '0')  # Replace 'Free' with '0'
-
-# Remove commas and plus signs from the 'Installs' column
-df['Installs'] = df['Installs'].str.replace(',', '').str.replace('+', '')
-
-# Convert 'Installs' to numeric, coercing errors to NaN
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
-
-# Filter out apps with invalid 'Last Updated' dates
-df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
-df = df.dropna(subset=['Last Updated'])
-
-# Filter apps where name does not start with 'X', 'Y', 'Z' and category starts with 'E', 'C', or 'B'
-df = df[~df['App'].str.startswith(('X', 'Y', 'Z'))]
-df = df[df['Category'].str.startswith(('E', 'C', 'B'))]
-
-# Filter apps with more than 500 reviews
-df = df[df['Reviews'] > 500]
-
-# Add a 'Month' column for time series analysis
-df['Month'] = df['Last Updated'].dt.to_period('M')
-
-# Group data by Month and Category, summing up 'Installs'
-monthly_installs = df.groupby(['Month', 'Category'])['Installs'].sum().reset_index()
+from snapshot_store import list_snapshots, read_snapshots
+from pipeline import engine_from_args, run_task
+
+# Use the snapshot history when at least two snapshots are stored: month-over-month growth
+# then comes from real install counts over time instead of a single file's 'Last Updated'
+snapshot_dates = list_snapshots('apps')
+if len(snapshot_dates) >= 2:
+    # Only the last snapshot of each month is read, picked from the partition names,
+    # and only the columns the trend needs
+    month_ends = list({snapshot_date[:7]: snapshot_date for snapshot_date in snapshot_dates}.values())
+    df = read_snapshots('apps', columns=['App', 'Category', 'Installs', 'Reviews'], dates=month_ends)
+    df = df.dropna(subset=['App', 'Category'])
+    df = df[~df['App'].str.startswith(('X', 'Y', 'Z'))]
+    df = df[df['Category'].str.startswith(('E', 'C', 'B'))]
+    df = df[df['Reviews'] > 500]
+
+    # One row per app within each month
+    df['Month'] = df['Snapshot Date'].dt.to_period('M')
+    df = df.sort_values('Reviews').drop_duplicates(['Month', 'App'], keep='last')
+
+    # Group data by Month and Category, summing up 'Installs'
+    monthly_installs = df.groupby(['Month', 'Category'])['Installs'].sum().reset_index()
+else:
+    # Filter apps by name, category and reviews, and sum installs per 'Last Updated' month
+    # and Category on the selected engine (see pipeline.py)
+    monthly_installs = run_task('task8', engine_from_args())
+    monthly_installs['Month'] = monthly_installs['Month'].dt.to_period('M')
 
 # Calculate the month-over-month percentage change in installs
 monthly_installs['Installs Growth (%)'] = monthly_installs.groupby('Category')['Installs'].pct_change() * 100
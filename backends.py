@@ -0,0 +1,512 @@
+import operator
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Execution backends for the cleaning and aggregation pipeline.
+#
+# Analyses are written once as a Plan (scan -> filter / with_columns / join /
+# group_by / sort / limit) over small column expressions. Each backend compiles
+# the same plan to its own engine:
+#
+#   pandas  eager, in memory (the behaviour every script had before)
+#   polars  lazy frames, with predicate/projection pushdown and streaming scans
+#   duckdb  one SQL query over the CSV/Parquet files, multithreaded and able to
+#           spill to disk
+#
+# Sources are read with every column as text and cleaned through expressions,
+# so all three engines parse the same strings the same way. Boolean predicates
+# treat missing values as False in every backend (pandas semantics), and
+# group_by drops null keys and returns groups sorted by key.
+
+NA_VALUES = ["", "nan", "NaN", "NA", "N/A", "null", "NULL", "None"]
+DATE_FORMAT = "%B %d, %Y"
+
+COMPARISONS = {"gt": operator.gt, "ge": operator.ge, "lt": operator.lt, "le": operator.le, "eq": operator.eq, "ne": operator.ne}
+ARITHMETIC = {"add": operator.add, "sub": operator.sub, "mul": operator.mul, "div": operator.truediv}
+
+
+class Expr:
+    def __init__(self, op, *args):
+        self.op = op
+        self.args = args
+
+    __hash__ = None
+
+    def _binary(self, op, other):
+        return Expr(op, self, wrap(other))
+
+    def __gt__(self, other): return self._binary("gt", other)
+    def __ge__(self, other): return self._binary("ge", other)
+    def __lt__(self, other): return self._binary("lt", other)
+    def __le__(self, other): return self._binary("le", other)
+    def __eq__(self, other): return self._binary("eq", other)
+    def __ne__(self, other): return self._binary("ne", other)
+    def __and__(self, other): return self._binary("and", other)
+    def __or__(self, other): return self._binary("or", other)
+    def __invert__(self): return Expr("not", self)
+    def __add__(self, other): return self._binary("add", other)
+    def __sub__(self, other): return self._binary("sub", other)
+    def __mul__(self, other): return self._binary("mul", other)
+    def __truediv__(self, other): return self._binary("div", other)
+
+    def isin(self, values): return Expr("isin", self, tuple(values))
+    def startswith(self, prefixes): return Expr("startswith", self, tuple(np.atleast_1d(prefixes)))
+    def contains(self, text, case=True): return Expr("contains", self, text, case)
+    def is_not_null(self): return Expr("not_null", self)
+    def str_len(self): return Expr("str_len", self)
+
+    # Cleaning helpers for the raw Play Store text columns
+    def parse_number(self): return Expr("parse_number", self)           # '10,000+', '$4.99', '4.1'
+    def parse_size_mb(self): return Expr("parse_size_mb", self)         # '19M', '201k', 'Varies with device'
+    def parse_date(self, fmt=DATE_FORMAT): return Expr("parse_date", self, fmt)
+    def major_version(self): return Expr("major_version", self)         # '4.0.3 and up' -> 4.0
+    def month(self): return Expr("month", self)
+    def month_start(self): return Expr("month_start", self)
+
+
+def col(name):
+    return Expr("col", name)
+
+
+def lit(value):
+    return Expr("lit", value)
+
+
+def wrap(value):
+    return value if isinstance(value, Expr) else lit(value)
+
+
+def case(*conditions, default=None):
+    """case((cond, value), ..., default=value), like SQL CASE WHEN."""
+    return Expr("case", tuple((cond, wrap(value)) for cond, value in conditions), wrap(default))
+
+
+class Plan:
+    """An immutable chain of steps, started from a named source table."""
+
+    def __init__(self, steps):
+        self.steps = tuple(steps)
+
+    def _then(self, *step):
+        return Plan(self.steps + (step,))
+
+    def filter(self, predicate):
+        return self._then("filter", predicate)
+
+    def with_columns(self, **exprs):
+        # Expressions see the columns as they were before this step
+        return self._then("with_columns", exprs)
+
+    def select(self, *columns):
+        return self._then("select", columns)
+
+    def drop_nulls(self, *columns):
+        return self._then("drop_nulls", columns)
+
+    def join(self, other, on):
+        # Inner join; the two sides must not share any column except `on`
+        return self._then("join", other, on)
+
+    def semi_join(self, other, on):
+        # Keep rows whose `on` value appears in the other plan's result
+        return self._then("semi_join", other, on)
+
+    def group_by(self, keys, **aggs):
+        # aggs: name=(fn, column) with fn in size/sum/mean/min/max
+        return self._then("group_by", [keys] if isinstance(keys, str) else list(keys), aggs)
+
+    def sort(self, by, descending=False):
+        by = [by] if isinstance(by, str) else list(by)
+        descending = [descending] * len(by) if isinstance(descending, bool) else list(descending)
+        return self._then("sort", by, descending)
+
+    def limit(self, n):
+        return self._then("limit", n)
+
+    def tables(self):
+        # Source tables scanned by this plan and the plans it joins with
+        tables = set()
+        for step in self.steps:
+            if step[0] == "scan":
+                tables.add(step[1])
+            elif step[0] in ("join", "semi_join"):
+                tables |= step[1].tables()
+        return tables
+
+
+def scan(table):
+    return Plan([("scan", table)])
+
+
+class Backend:
+    name = None
+
+    def __init__(self, sources):
+        # Checked up front: each engine reports a missing file with its own exception type
+        for table, path in sources.items():
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Source '{table}' not found: {path}")
+        self.sources = sources
+
+    def run(self, plan):
+        """Execute a plan and return the result as a pandas DataFrame."""
+        raise NotImplementedError
+
+
+class PandasBackend(Backend):
+    name = "pandas"
+
+    def read(self, table):
+        path = self.sources[table]
+        if path.endswith(".parquet"):
+            return pd.read_parquet(path)
+        return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=NA_VALUES)
+
+    def eval(self, expr, df):
+        op, args = expr.op, expr.args
+        if op == "col":
+            return df[args[0]]
+        if op == "lit":
+            return args[0]
+        if op in COMPARISONS:
+            a, b = self.eval(args[0], df), self.eval(args[1], df)
+            return COMPARISONS[op](a, b) & pd.notna(a) & pd.notna(b)
+        if op == "and":
+            return self.eval(args[0], df) & self.eval(args[1], df)
+        if op == "or":
+            return self.eval(args[0], df) | self.eval(args[1], df)
+        if op == "not":
+            return ~self.eval(args[0], df)
+        if op in ARITHMETIC:
+            return ARITHMETIC[op](self.eval(args[0], df), self.eval(args[1], df))
+        if op == "case":
+            conditions = [self.eval(cond, df) for cond, _ in args[0]]
+            values = [self.eval(value, df) for _, value in args[0]]
+            default = self.eval(args[1], df)
+            return pd.Series(np.select(conditions, values, default=default), index=df.index)
+
+        a = self.eval(args[0], df)
+        if op == "isin":
+            return a.isin(args[1])
+        if op == "startswith":
+            return a.str.startswith(args[1], na=False)
+        if op == "contains":
+            return a.str.contains(args[1], case=args[2], regex=False, na=False)
+        if op == "not_null":
+            return a.notna()
+        if op == "str_len":
+            return a.str.len()
+        if op == "parse_number":
+            text = a.astype(str).str.replace(r"[,+$]", "", regex=True).where(a.notna())
+            return pd.to_numeric(text, errors="coerce").astype(float)
+        if op == "parse_size_mb":
+            text = a.astype(str)
+            number = pd.to_numeric(text.str.replace(r"[Mk,]", "", regex=True), errors="coerce")
+            return number.where(text.str.contains("M", regex=False), number.where(text.str.contains("k", regex=False)) / 1024)
+        if op == "parse_date":
+            return pd.to_datetime(a, format=args[1], errors="coerce")
+        if op == "major_version":
+            return pd.to_numeric(a.astype(str).str.split(".").str[0], errors="coerce").where(a.notna())
+        if op == "month":
+            return a.dt.month.astype(float)
+        if op == "month_start":
+            return a.dt.to_period("M").dt.to_timestamp()
+        raise ValueError(f"Unsupported expression: {op}")
+
+    def run(self, plan):
+        df = None
+        for step in plan.steps:
+            kind = step[0]
+            if kind == "scan":
+                df = self.read(step[1])
+            elif kind == "filter":
+                df = df[self.eval(step[1], df)]
+            elif kind == "with_columns":
+                df = df.assign(**{name: self.eval(expr, df) for name, expr in step[1].items()})
+            elif kind == "select":
+                df = df[list(step[1])]
+            elif kind == "drop_nulls":
+                df = df.dropna(subset=list(step[1]))
+            elif kind == "join":
+                other = self.run(step[1]).dropna(subset=[step[2]])
+                df = pd.merge(df.dropna(subset=[step[2]]), other, on=step[2], how="inner")
+            elif kind == "semi_join":
+                df = df[df[step[2]].isin(self.run(step[1])[step[2]])]
+            elif kind == "group_by":
+                keys, aggs = step[1], step[2]
+                named = {name: (column or keys[0], fn) for name, (fn, column) in aggs.items()}
+                df = df.dropna(subset=keys).groupby(keys, sort=True).agg(**named).reset_index()
+            elif kind == "sort":
+                df = df.sort_values(step[1], ascending=[not d for d in step[2]], kind="stable", na_position="last")
+            elif kind == "limit":
+                df = df.head(step[1])
+        return df.reset_index(drop=True)
+
+
+class PolarsBackend(Backend):
+    name = "polars"
+
+    def __init__(self, sources):
+        super().__init__(sources)
+        import polars as pl
+        self.pl = pl
+
+    def read(self, table):
+        path = self.sources[table]
+        if path.endswith(".parquet"):
+            return self.pl.scan_parquet(path)
+        return self.pl.scan_csv(path, infer_schema_length=0, null_values=NA_VALUES)
+
+    def to_number(self, text):
+        return text.cast(self.pl.Float64, strict=False).fill_nan(None)
+
+    def eval(self, expr):
+        pl = self.pl
+        op, args = expr.op, expr.args
+        if op == "col":
+            return pl.col(args[0])
+        if op == "lit":
+            return pl.lit(args[0])
+        if op in COMPARISONS:
+            return COMPARISONS[op](self.eval(args[0]), self.eval(args[1])).fill_null(False)
+        if op == "and":
+            return self.eval(args[0]) & self.eval(args[1])
+        if op == "or":
+            return self.eval(args[0]) | self.eval(args[1])
+        if op == "not":
+            return ~self.eval(args[0])
+        if op in ARITHMETIC:
+            return ARITHMETIC[op](self.eval(args[0]), self.eval(args[1]))
+        if op == "case":
+            (first_cond, first_value), *rest = args[0]
+            result = pl.when(self.eval(first_cond)).then(self.eval(first_value))
+            for cond, value in rest:
+                result = result.when(self.eval(cond)).then(self.eval(value))
+            return result.otherwise(self.eval(args[1]))
+
+        a = self.eval(args[0])
+        if op == "isin":
+            return a.is_in(list(args[1])).fill_null(False)
+        if op == "startswith":
+            return pl.any_horizontal([a.str.starts_with(prefix) for prefix in args[1]]).fill_null(False)
+        if op == "contains":
+            text, pattern = (a, args[1]) if args[2] else (a.str.to_lowercase(), args[1].lower())
+            return text.str.contains(pattern, literal=True).fill_null(False)
+        if op == "not_null":
+            return a.is_not_null()
+        if op == "str_len":
+            return a.str.len_chars().cast(pl.Float64)
+        if op == "parse_number":
+            return self.to_number(a.cast(pl.Utf8).str.replace_all(r"[,+$]", ""))
+        if op == "parse_size_mb":
+            text = a.cast(pl.Utf8)
+            number = self.to_number(text.str.replace_all(r"[Mk,]", ""))
+            return pl.when(text.str.contains("M", literal=True)).then(number) \
+                .when(text.str.contains("k", literal=True)).then(number / 1024) \
+                .otherwise(None)
+        if op == "parse_date":
+            text = a.cast(pl.Utf8)
+            return pl.coalesce(
+                text.str.strptime(pl.Datetime("us"), args[1], strict=False),
+                text.str.strptime(pl.Datetime("us"), "%Y-%m-%d %H:%M:%S%.f", strict=False),
+            )
+        if op == "major_version":
+            return self.to_number(a.cast(pl.Utf8).str.split(".").list.first())
+        if op == "month":
+            return a.dt.month().cast(pl.Float64)
+        if op == "month_start":
+            return a.dt.truncate("1mo")
+        raise ValueError(f"Unsupported expression: {op}")
+
+    def lazy(self, plan):
+        pl = self.pl
+        lf = None
+        for step in plan.steps:
+            kind = step[0]
+            if kind == "scan":
+                lf = self.read(step[1])
+            elif kind == "filter":
+                lf = lf.filter(self.eval(step[1]))
+            elif kind == "with_columns":
+                lf = lf.with_columns([self.eval(expr).alias(name) for name, expr in step[1].items()])
+            elif kind == "select":
+                lf = lf.select(list(step[1]))
+            elif kind == "drop_nulls":
+                lf = lf.drop_nulls(list(step[1]))
+            elif kind == "join":
+                lf = lf.join(self.lazy(step[1]), on=step[2], how="inner")
+            elif kind == "semi_join":
+                lf = lf.join(self.lazy(step[1]), on=step[2], how="semi")
+            elif kind == "group_by":
+                keys, aggs = step[1], step[2]
+                exprs = []
+                for name, (fn, column) in aggs.items():
+                    if fn == "size":
+                        exprs.append(pl.len().cast(pl.Int64).alias(name))
+                    else:
+                        exprs.append(getattr(pl.col(column), fn)().alias(name))
+                lf = lf.drop_nulls(keys).group_by(keys).agg(exprs).sort(keys)
+            elif kind == "sort":
+                lf = lf.sort(step[1], descending=step[2], nulls_last=True, maintain_order=True)
+            elif kind == "limit":
+                lf = lf.limit(step[1])
+        return lf
+
+    def run(self, plan):
+        return self.lazy(plan).collect().to_pandas()
+
+
+class DuckDBBackend(Backend):
+    name = "duckdb"
+
+    def __init__(self, sources):
+        super().__init__(sources)
+        import duckdb
+        self.con = duckdb.connect()
+
+    @staticmethod
+    def quote(name):
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def literal(value):
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            return repr(float(value)) if isinstance(value, (float, np.floating)) else str(int(value))
+        if isinstance(value, (datetime, pd.Timestamp)):
+            return f"TIMESTAMP '{pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')}'"
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def read(self, table):
+        path = self.literal(self.sources[table])
+        if self.sources[table].endswith(".parquet"):
+            return f"SELECT * FROM read_parquet({path})"
+        nullstr = "[" + ", ".join(self.literal(v) for v in NA_VALUES) + "]"
+        return f"SELECT * FROM read_csv({path}, header = true, all_varchar = true, nullstr = {nullstr})"
+
+    @staticmethod
+    def to_number(text):
+        return f"NULLIF(TRY_CAST({text} AS DOUBLE), 'NaN'::DOUBLE)"
+
+    def eval(self, expr):
+        op, args = expr.op, expr.args
+        if op == "col":
+            return self.quote(args[0])
+        if op == "lit":
+            return self.literal(args[0])
+        if op in COMPARISONS:
+            symbol = {"gt": ">", "ge": ">=", "lt": "<", "le": "<=", "eq": "=", "ne": "<>"}[op]
+            return f"COALESCE(({self.eval(args[0])} {symbol} {self.eval(args[1])}), FALSE)"
+        if op in ("and", "or"):
+            return f"({self.eval(args[0])} {op.upper()} {self.eval(args[1])})"
+        if op == "not":
+            return f"(NOT {self.eval(args[0])})"
+        if op in ARITHMETIC:
+            symbol = {"add": "+", "sub": "-", "mul": "*", "div": "/"}[op]
+            return f"({self.eval(args[0])} {symbol} {self.eval(args[1])})"
+        if op == "case":
+            whens = " ".join(f"WHEN {self.eval(cond)} THEN {self.eval(value)}" for cond, value in args[0])
+            return f"(CASE {whens} ELSE {self.eval(args[1])} END)"
+
+        a = self.eval(args[0])
+        text = f"CAST({a} AS VARCHAR)"
+        if op == "isin":
+            values = ", ".join(self.literal(v) for v in args[1])
+            return f"COALESCE(({a} IN ({values})), FALSE)"
+        if op == "startswith":
+            tests = " OR ".join(f"starts_with({a}, {self.literal(p)})" for p in args[1])
+            return f"COALESCE(({tests}), FALSE)"
+        if op == "contains":
+            haystack, needle = (a, args[1]) if args[2] else (f"lower({a})", args[1].lower())
+            return f"COALESCE(contains({haystack}, {self.literal(needle)}), FALSE)"
+        if op == "not_null":
+            return f"({a} IS NOT NULL)"
+        if op == "str_len":
+            return f"CAST(length({a}) AS DOUBLE)"
+        if op == "parse_number":
+            return self.to_number(f"regexp_replace({text}, '[,+$]', '', 'g')")
+        if op == "parse_size_mb":
+            number = self.to_number(f"regexp_replace({text}, '[Mk,]', '', 'g')")
+            return f"(CASE WHEN contains({text}, 'M') THEN {number} WHEN contains({text}, 'k') THEN {number} / 1024 END)"
+        if op == "parse_date":
+            return f"COALESCE(TRY_STRPTIME({text}, {self.literal(args[1])}), TRY_CAST({text} AS TIMESTAMP))"
+        if op == "major_version":
+            return self.to_number(f"split_part({text}, '.', 1)")
+        if op == "month":
+            return f"CAST(month({a}) AS DOUBLE)"
+        if op == "month_start":
+            return f"CAST(date_trunc('month', {a}) AS TIMESTAMP)"
+        raise ValueError(f"Unsupported expression: {op}")
+
+    def sql(self, plan):
+        query = None
+        previous = None
+        for step in plan.steps:
+            kind = step[0]
+            source = f"({query}) AS t"
+            if kind == "scan":
+                query = self.read(step[1])
+            elif kind == "filter":
+                query = f"SELECT * FROM {source} WHERE {self.eval(step[1])}"
+            elif kind == "with_columns":
+                # Replace existing columns in place and append new ones, like pandas assign
+                existing = self.con.sql(query).columns
+                replaced = [name for name in step[1] if name in existing]
+                added = [name for name in step[1] if name not in existing]
+                select = "*"
+                if replaced:
+                    select += " REPLACE (" + ", ".join(f"{self.eval(step[1][n])} AS {self.quote(n)}" for n in replaced) + ")"
+                select += "".join(f", {self.eval(step[1][n])} AS {self.quote(n)}" for n in added)
+                query = f"SELECT {select} FROM {source}"
+            elif kind == "select":
+                query = f"SELECT {', '.join(self.quote(c) for c in step[1])} FROM {source}"
+            elif kind == "drop_nulls":
+                conditions = " AND ".join(f"{self.quote(c)} IS NOT NULL" for c in step[1])
+                query = f"SELECT * FROM {source} WHERE {conditions}"
+            elif kind == "join":
+                query = f"SELECT * FROM {source} JOIN ({self.sql(step[1])}) AS o USING ({self.quote(step[2])})"
+            elif kind == "semi_join":
+                key = self.quote(step[2])
+                query = f"SELECT * FROM {source} WHERE {key} IN (SELECT {key} FROM ({self.sql(step[1])}) AS o)"
+            elif kind == "group_by":
+                keys, aggs = step[1], step[2]
+                quoted = ", ".join(self.quote(k) for k in keys)
+                columns = []
+                for name, (fn, column) in aggs.items():
+                    if fn == "size":
+                        columns.append(f"COUNT(*) AS {self.quote(name)}")
+                    elif fn == "sum":
+                        columns.append(f"COALESCE(SUM({self.quote(column)}), 0) AS {self.quote(name)}")
+                    else:
+                        sql_fn = {"mean": "AVG", "min": "MIN", "max": "MAX"}[fn]
+                        columns.append(f"{sql_fn}({self.quote(column)}) AS {self.quote(name)}")
+                not_null = " AND ".join(f"{self.quote(k)} IS NOT NULL" for k in keys)
+                query = f"SELECT {quoted}, {', '.join(columns)} FROM {source} WHERE {not_null} GROUP BY {quoted} ORDER BY {quoted}"
+            elif kind == "sort":
+                order = ", ".join(f"{self.quote(c)} {'DESC' if d else 'ASC'} NULLS LAST" for c, d in zip(step[1], step[2]))
+                query = f"SELECT * FROM {source} ORDER BY {order}"
+            elif kind == "limit" and previous == "sort":
+                # Apply the limit in the same query so the ordering is guaranteed
+                query += f" LIMIT {int(step[1])}"
+            elif kind == "limit":
+                query = f"SELECT * FROM {source} LIMIT {int(step[1])}"
+            previous = kind
+        return query
+
+    def run(self, plan):
+        return self.con.sql(self.sql(plan)).df()
+
+
+BACKENDS = {backend.name: backend for backend in [PandasBackend, PolarsBackend, DuckDBBackend]}
+
+
+def get_backend(name, sources):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown engine '{name}', choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name](sources)
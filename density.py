@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# Server-side violin statistics: per-category KDE curves computed with binned/FFT
+# estimation and box-plot quantiles, so charts only ship the summaries instead of
+# every raw rating
+
+SUMMARY_COLUMNS = ['q1', 'median', 'q3', 'count', 'mean', 'lower_whisker', 'upper_whisker', 'outliers', 'grid', 'density']
+
+# Ratings are given in 0.1 steps, so no category's KDE should be narrower than that
+MIN_BANDWIDTH = 0.1
+
+
+def scott_bandwidth(values, min_bandwidth=MIN_BANDWIDTH):
+    # Same rule scipy/seaborn use by default for gaussian KDEs, floored so that a
+    # category whose values are all equal still gets a visible density
+    n = len(values)
+    if n == 0:
+        return np.nan
+    if n < 2:
+        return min_bandwidth
+    return max(np.std(values, ddof=1) * n ** (-1 / 5), min_bandwidth)
+
+
+def binned_kde(values, grid_min, grid_max, bandwidth, grid_size=256):
+    """Gaussian KDE of values evaluated on an even grid of grid_size points.
+
+    Values are linearly binned onto the grid and convolved with the kernel via
+    FFT, so the cost depends on the grid size rather than on the number of
+    ratings. Ratings sit on a 0.1 step grid, so binning is nearly lossless.
+    """
+    grid = np.linspace(grid_min, grid_max, grid_size)
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0 or not np.isfinite(bandwidth) or bandwidth <= 0 or grid_max <= grid_min:
+        return grid, np.zeros(grid_size)
+
+    # Linear binning: split each value's weight between its two neighbouring grid points
+    step = grid[1] - grid[0]
+    pos = np.clip((values - grid_min) / step, 0, grid_size - 1)
+    left = np.minimum(np.floor(pos).astype(int), grid_size - 2)
+    frac = pos - left
+    counts = np.bincount(left, weights=1 - frac, minlength=grid_size)
+    counts += np.bincount(left + 1, weights=frac, minlength=grid_size)
+
+    # Kernel sampled at every grid offset, zero-padded so the convolution does not wrap
+    offsets = np.arange(-(grid_size - 1), grid_size) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    fft_size = 1 << int(np.ceil(np.log2(3 * grid_size)))
+    smoothed = np.fft.irfft(np.fft.rfft(counts, fft_size) * np.fft.rfft(kernel, fft_size), fft_size)
+    density = smoothed[grid_size - 1:2 * grid_size - 1] / len(values)
+    return grid, np.maximum(density, 0)
+
+
+def category_densities(df, category_col, value_col, grid_size=256, cut=2, max_outliers=50, seed=0):
+    """Per-category KDE curves and box-plot summaries for a violin chart.
+
+    Returns a DataFrame with one row per category holding the density curve,
+    quartiles, whisker ends (1.5 IQR rule), count, mean and at most
+    max_outliers sampled outlier values.
+    """
+    data = df[[category_col, value_col]].dropna()
+    if data.empty:
+        return pd.DataFrame(columns=[category_col] + SUMMARY_COLUMNS)
+    grouped = data.groupby(category_col)[value_col]
+
+    # Box-plot quantiles in one grouped pass
+    summary = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    summary.columns = ['q1', 'median', 'q3']
+    summary['count'] = grouped.size()
+    summary['mean'] = grouped.mean()
+    iqr = summary['q3'] - summary['q1']
+    lower_limit = summary['q1'] - 1.5 * iqr
+    upper_limit = summary['q3'] + 1.5 * iqr
+
+    # Whiskers end at the most extreme values still inside the fences
+    limits = data[category_col].map(lower_limit), data[category_col].map(upper_limit)
+    inside = (data[value_col] >= limits[0]) & (data[value_col] <= limits[1])
+    summary['lower_whisker'] = data[inside].groupby(category_col)[value_col].min()
+    summary['upper_whisker'] = data[inside].groupby(category_col)[value_col].max()
+
+    # Cap the outlier points shipped to the renderer
+    outliers = data[~inside]
+    outliers = outliers.sample(frac=1, random_state=seed).groupby(category_col).head(max_outliers)
+    outlier_values = outliers.groupby(category_col)[value_col].apply(list)
+    summary['outliers'] = [outlier_values.get(category, []) for category in summary.index]
+
+    grids, densities = [], []
+    for category, values in grouped:
+        values = values.to_numpy(dtype=float)
+        bandwidth = scott_bandwidth(values)
+        pad = cut * bandwidth if np.isfinite(bandwidth) else 0
+        grid, density = binned_kde(values, values.min() - pad, values.max() + pad, bandwidth, grid_size)
+        grids.append(grid)
+        densities.append(density)
+    summary['grid'] = pd.Series(grids, index=summary.index)
+    summary['density'] = pd.Series(densities, index=summary.index)
+
+    return summary.reset_index()
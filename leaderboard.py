@@ -0,0 +1,77 @@
+import pandas as pd
+
+# Materialized per-category leaderboard: app counts, install sums, review sums and
+# mean rating per category, kept up to date by adding or removing rows instead of
+# regrouping the whole apps table for every "top N categories by X" question.
+
+STAT_COLUMNS = ['count', 'installs', 'reviews', 'rating_sum', 'rating_count']
+METRICS = ['count', 'installs', 'reviews', 'rating']
+
+
+def aggregate(df):
+    # Per-category sufficient statistics of a batch of cleaned app rows
+    grouped = df.groupby('Category')
+    return pd.DataFrame({
+        'count': grouped.size(),
+        'installs': grouped['Installs'].sum(),
+        'reviews': grouped['Reviews'].sum(),
+        'rating_sum': grouped['Rating'].sum(),
+        'rating_count': grouped['Rating'].count(),
+    }).astype(float)
+
+
+class CategoryLeaderboard:
+    def __init__(self, stats=None):
+        if stats is None:
+            stats = pd.DataFrame(columns=STAT_COLUMNS, dtype=float)
+        self.stats = stats
+        self.stats.index.name = 'Category'
+
+    @classmethod
+    def from_apps(cls, df):
+        """Build a leaderboard from app rows with numeric Installs, Reviews and Rating."""
+        return cls(aggregate(df))
+
+    def add(self, df):
+        """Account for newly appended app rows."""
+        self.stats = self.stats.add(aggregate(df), fill_value=0)
+
+    def remove(self, df):
+        """Account for app rows that were removed; categories left empty are dropped."""
+        self.stats = self.stats.sub(aggregate(df), fill_value=0)
+        self.stats = self.stats[self.stats['count'] > 0]
+
+    def table(self):
+        table = self.stats[['count', 'installs', 'reviews']].copy()
+        table['rating'] = self.stats['rating_sum'] / self.stats['rating_count'].where(self.stats['rating_count'] > 0)
+        table['count'] = table['count'].astype(int)
+        return table
+
+    def top(self, n, by='count', exclude_prefixes=(), exclude=(), include=None, ascending=False):
+        """Top n categories by a metric, as a Series indexed by category.
+
+        exclude_prefixes drops categories starting with any of the given
+        prefixes, exclude drops the given categories and include, if set,
+        restricts the ranking to the given categories.
+        """
+        if by not in METRICS:
+            raise ValueError(f"Unknown metric '{by}', choose from {', '.join(METRICS)}")
+        ranking = self.table()[by].dropna()
+        categories = ranking.index.to_series()
+        keep = ~categories.isin(list(exclude))
+        if exclude_prefixes:
+            keep &= ~categories.str.startswith(tuple(exclude_prefixes))
+        if include is not None:
+            keep &= categories.isin(list(include))
+        ranking = ranking[keep]
+
+        # Ties are broken by category name so the ranking is stable
+        order = ranking.reset_index().sort_values([by, 'Category'], ascending=[ascending, True], kind='stable')
+        return order.set_index('Category')[by].head(n)
+
+    def save(self, path):
+        self.stats.to_csv(path)
+
+    @classmethod
+    def load(cls, path):
+        return cls(pd.read_csv(path, index_col='Category').astype(float))
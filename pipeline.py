@@ -0,0 +1,190 @@
+import argparse
+import os
+
+import pandas as pd
+
+from backends import BACKENDS, case, col, get_backend, lit, scan
+
+# Cleaning and aggregation steps of Task 1 - Task 9, written once as backend
+# plans. The scripts only draw the charts from the returned frames.
+#
+#   python pipeline.py task4 --engine duckdb          print a task's result
+#   python pipeline.py all --engine polars --check    compare an engine with pandas
+#
+# The scripts accept the same --engine flag, or read PLAYSTORE_ENGINE.
+
+SOURCES = {
+    "apps": "googleplaystore.csv",
+    "reviews": "googleplaystore_user_reviews.csv",
+}
+
+
+def engine_from_args():
+    # parse_known_args so the scripts still run inside Jupyter
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--engine", default=os.environ.get("PLAYSTORE_ENGINE", "pandas"), choices=list(BACKENDS))
+    return parser.parse_known_args()[0].engine
+
+
+def apps_clean():
+    return scan("apps").with_columns(
+        Installs=col("Installs").parse_number(),
+        Reviews=col("Reviews").parse_number(),
+        Rating=col("Rating").parse_number(),
+        Price=col("Price").parse_number(),
+        Size_MB=col("Size").parse_size_mb(),
+        **{"Last Updated": col("Last Updated").parse_date()},
+    )
+
+
+def task1():
+    # Sentiment counts for the 5 most reviewed apps
+    reviews = scan("reviews").drop_nulls("Sentiment") \
+        .with_columns(Sentiment_Polarity=col("Sentiment_Polarity").parse_number())
+    polarity = col("Sentiment_Polarity")
+    reviews = reviews.with_columns(Sentiment=case((polarity > 0, "Positive"), (polarity < 0, "Negative"), default="Neutral"))
+    top_apps = reviews.group_by("App", Count=("size", None)).sort(["Count", "App"], [True, False]).limit(5)
+    return reviews.semi_join(top_apps, "App").group_by(["App", "Sentiment"], Count=("size", None))
+
+
+def task2():
+    # Paid apps with their revenue
+    return apps_clean() \
+        .filter((col("Type") == "Paid") & col("Installs").is_not_null() & col("Category").is_not_null() & col("Price").is_not_null()) \
+        .with_columns(Revenue=col("Price") * col("Installs")) \
+        .drop_nulls("Revenue", "Installs") \
+        .select("App", "Category", "Installs", "Price", "Revenue") \
+        .sort(["App", "Installs", "Revenue"])
+
+
+def task3():
+    # Mean installs and revenue by type in the 3 largest categories after filtering
+    apps = apps_clean().with_columns(
+        Revenue=col("Price") * col("Installs"),
+        Android_Major=col("Android Ver").major_version(),
+        App_Length=col("App").str_len(),
+    )
+    filtered = apps.filter(
+        (col("Installs") > 10000)
+        & (((col("Type") == "Paid") & (col("Revenue") > 10000)) | (col("Type") == "Free"))
+        & (col("Android_Major") > 4.0)
+        & (col("Size_MB") > 15)
+        & (col("Content Rating") == "Everyone")
+        & (col("App_Length") <= 30)
+    )
+    top_categories = filtered.group_by("Category", Count=("size", None)).sort(["Count", "Category"], [True, False]).limit(3)
+    return filtered.semi_join(top_categories, "Category") \
+        .group_by(["Category", "Type"], Installs=("mean", "Installs"), Revenue=("mean", "Revenue"))
+
+
+def task4():
+    # Top 10 categories by installs among well rated, large apps updated in January
+    return apps_clean() \
+        .drop_nulls("Rating", "Size", "Category", "Reviews", "Installs", "Last Updated") \
+        .filter((col("Rating") >= 4.0) & (col("Size_MB") >= 10.0) & (col("Last Updated").month() == 1)) \
+        .group_by("Category", Rating=("mean", "Rating"), Reviews=("sum", "Reviews"), Installs=("sum", "Installs")) \
+        .sort(["Installs", "Category"], [True, False]) \
+        .limit(10)
+
+
+def task5():
+    # Total installs per category, excluding categories starting with A, C, G or S
+    return apps_clean() \
+        .filter(~col("Category").startswith(("A", "C", "G", "S"))) \
+        .group_by("Category", Installs=("sum", "Installs"))
+
+
+def task6():
+    # Ratings of low rated apps with 'C' in the name, in categories with more than 50 such apps
+    filtered = apps_clean().filter(
+        col("App").contains("C", case=False) & (col("Reviews") >= 10) & (col("Rating") < 4.0) & col("Category").is_not_null()
+    )
+    valid_categories = filtered.group_by("Category", Count=("size", None)).filter(col("Count") > 50)
+    return filtered.semi_join(valid_categories, "Category") \
+        .select("App", "Category", "Rating") \
+        .sort(["Category", "App", "Rating"])
+
+
+def task7(reference_date=None):
+    # Popular apps updated in the year before reference_date (today by default)
+    one_year_ago = pd.Timestamp(reference_date or pd.Timestamp.today()) - pd.DateOffset(years=1)
+    return apps_clean() \
+        .filter(
+            (col("Last Updated") > lit(one_year_ago))
+            & (col("Installs") >= 100000)
+            & (col("Reviews") > 1000)
+            & ~col("Category").startswith(("A", "F", "E", "G", "I", "K"))
+        ) \
+        .select("App", "Installs", "Rating", "Reviews") \
+        .sort(["App", "Installs", "Reviews"])
+
+
+def task8():
+    # Monthly installs per category for apps with more than 500 reviews
+    return apps_clean() \
+        .drop_nulls("Last Updated") \
+        .filter(~col("App").startswith(("X", "Y", "Z")) & col("Category").startswith(("E", "C", "B")) & (col("Reviews") > 500)) \
+        .with_columns(Month=col("Last Updated").month_start()) \
+        .group_by(["Month", "Category"], Installs=("sum", "Installs"))
+
+
+def task9():
+    # Per-app averages for the bubble chart, joined with review subjectivity
+    apps = apps_clean().drop_nulls("Rating", "Size", "Installs", "Category", "Reviews")
+    reviews = scan("reviews") \
+        .with_columns(Sentiment_Subjectivity=col("Sentiment_Subjectivity").parse_number()) \
+        .drop_nulls("App", "Sentiment_Subjectivity") \
+        .select("App", "Sentiment_Subjectivity")
+    categories = ["GAME", "BEAUTY", "BUSINESS", "COMICS", "COMMUNICATION", "DATING", "ENTERTAINMENT", "SOCIAL", "EVENTS"]
+    return apps.join(reviews, "App") \
+        .filter(
+            (col("Rating") > 3.5)
+            & col("Category").isin(categories)
+            & (col("Reviews") > 500)
+            & (col("Sentiment_Subjectivity") > 0.5)
+            & (col("Installs") > 50000)
+            & col("Size_MB").is_not_null()
+        ) \
+        .group_by(
+            "App",
+            Avg_Rating=("mean", "Rating"),
+            Avg_Size_MB=("mean", "Size_MB"),
+            Total_Installs=("max", "Installs"),
+            Category=("min", "Category"),
+        )
+
+
+TASKS = {f"task{i}": task for i, task in enumerate([task1, task2, task3, task4, task5, task6, task7, task8, task9], start=1)}
+
+
+def run_task(task, engine="pandas", sources=None, **kwargs):
+    # Only the tables the task reads have to exist
+    plan = TASKS[task](**kwargs)
+    sources = {**SOURCES, **(sources or {})}
+    backend = get_backend(engine, {table: sources[table] for table in plan.tables()})
+    return backend.run(plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Task 1-9 aggregations on a chosen engine.")
+    parser.add_argument("task", choices=list(TASKS) + ["all"])
+    parser.add_argument("--engine", default="pandas", choices=list(BACKENDS))
+    parser.add_argument("--apps", default=SOURCES["apps"], help="Apps CSV or Parquet file")
+    parser.add_argument("--reviews", default=SOURCES["reviews"], help="Reviews CSV or Parquet file")
+    parser.add_argument("--check", action="store_true", help="Check the result matches the pandas engine")
+    args = parser.parse_args()
+
+    sources = {"apps": args.apps, "reviews": args.reviews}
+    for task in TASKS if args.task == "all" else [args.task]:
+        result = run_task(task, args.engine, sources)
+        print(f"{task}: {len(result)} rows")
+        if args.check:
+            expected = run_task(task, "pandas", sources)
+            pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+            print("  matches pandas")
+        else:
+            print(result.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Inverted index over the Translated_Review text of googleplaystore_user_reviews.csv
+#
+# A review ID is the 0-based row number of the review in the CSV, so IDs stay
+# valid as new scrapes are appended to the file. The index is a list of
+# segments; each build only tokenizes the rows added since the last one and
+# writes them as a new segment:
+#
+#   review_index/meta.json              vocabulary, app -> category map, segments
+#   review_index/segment_0000/*.npy     postings and per-review attributes
+#
+# Postings are stored as flat numpy arrays sorted by (term, review, position)
+# and memory-mapped at query time, so a lookup is a couple of slices.
+#
+# meta.json also records the byte length of the indexed part of the CSV and
+# hashes of its first and last bytes. If the file was rewritten rather than
+# appended to, the next build starts over instead of indexing the wrong rows.
+
+INDEX_DIR = "review_index"
+TOKEN_PATTERN = r"[a-z0-9']+"
+SENTIMENTS = ["Positive", "Neutral", "Negative"]
+MAX_POSITIONS = 1 << 20
+FINGERPRINT_BYTES = 1 << 16
+
+
+def tokenize(text):
+    return re.findall(TOKEN_PATTERN, str(text).lower())
+
+
+def load_meta(index_dir=INDEX_DIR):
+    path = os.path.join(index_dir, "meta.json")
+    if not os.path.exists(path):
+        return {"num_reviews": 0, "vocab": {}, "apps": [], "app_categories": {}, "segments": [], "source": None}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_meta(meta, index_dir=INDEX_DIR):
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def clear(index_dir=INDEX_DIR):
+    # Drop the metadata first so an interrupted clear still leaves an empty index
+    path = os.path.join(index_dir, "meta.json")
+    if os.path.exists(path):
+        os.remove(path)
+    for name in os.listdir(index_dir) if os.path.isdir(index_dir) else []:
+        if name.startswith("segment_"):
+            shutil.rmtree(os.path.join(index_dir, name))
+
+
+def fingerprint(path, size):
+    """Byte length and hashes of the first and last bytes of the first size bytes of path."""
+    with open(path, "rb") as f:
+        head = f.read(min(size, FINGERPRINT_BYTES))
+        f.seek(max(size - FINGERPRINT_BYTES, 0))
+        tail = f.read(size - f.tell())
+    return {"bytes": size, "head": hashlib.sha256(head).hexdigest(), "tail": hashlib.sha256(tail).hexdigest()}
+
+
+def build(reviews_path="googleplaystore_user_reviews.csv", apps_path="googleplaystore.csv", index_dir=INDEX_DIR):
+    """Index the reviews appended to reviews_path since the last build.
+
+    If the already indexed part of reviews_path changed, the index is
+    rebuilt from scratch. Returns the number of newly indexed reviews.
+    """
+    # Taken before reading, so rows appended during the build are indexed but not fingerprinted
+    size = os.path.getsize(reviews_path)
+    meta = load_meta(index_dir)
+    indexed = meta.get("source")
+    if meta["num_reviews"] and (indexed is None or indexed["bytes"] > size or fingerprint(reviews_path, indexed["bytes"]) != indexed):
+        clear(index_dir)
+        meta = load_meta(index_dir)
+    start = meta["num_reviews"]
+
+    # Skip rows that are already indexed
+    new_df = pd.read_csv(reviews_path, skiprows=range(1, start + 1))
+    new_df.columns = new_df.columns.str.strip()
+
+    # Refresh the app -> category map so category filters follow the latest apps file
+    if apps_path is not None and os.path.exists(apps_path):
+        apps_df = pd.read_csv(apps_path, usecols=["App", "Category"]).dropna()
+        meta["app_categories"] = apps_df.drop_duplicates("App").set_index("App")["Category"].to_dict()
+
+    meta["source"] = fingerprint(reviews_path, size)
+    if new_df.empty:
+        save_meta(meta, index_dir)
+        return 0
+
+    review_ids = np.arange(start, start + len(new_df), dtype=np.int64)
+
+    # Per-review attributes used for filtering and sentiment aggregates
+    app_codes = {app: i for i, app in enumerate(meta["apps"])}
+    for app in new_df["App"].dropna().unique():
+        if app not in app_codes:
+            app_codes[app] = len(meta["apps"])
+            meta["apps"].append(app)
+    app_code = new_df["App"].map(app_codes).fillna(-1).to_numpy(dtype=np.int32)
+    sentiment_code = new_df["Sentiment"].map({s: i for i, s in enumerate(SENTIMENTS)}).fillna(-1).to_numpy(dtype=np.int8)
+    polarity = pd.to_numeric(new_df["Sentiment_Polarity"], errors="coerce").to_numpy(dtype=np.float32)
+    subjectivity = pd.to_numeric(new_df["Sentiment_Subjectivity"], errors="coerce").to_numpy(dtype=np.float32)
+
+    # Tokenize all new reviews at once: one row per (review, position, token)
+    tokens = new_df["Translated_Review"].where(new_df["Translated_Review"].notna(), "").astype(str)
+    tokens = tokens.str.lower().str.findall(TOKEN_PATTERN)
+    tokens.index = review_ids
+    tokens = tokens.explode().dropna()
+    token_review = tokens.index.to_numpy(dtype=np.int64)
+    token_position = tokens.groupby(level=0).cumcount().to_numpy(dtype=np.int32)
+
+    vocab = meta["vocab"]
+    for term in tokens.unique():
+        if term not in vocab:
+            vocab[term] = len(vocab)
+    token_term = tokens.map(vocab).to_numpy(dtype=np.int32)
+
+    order = np.lexsort((token_position, token_review, token_term))
+    sorted_terms = token_term[order]
+    offsets = np.searchsorted(sorted_terms, np.arange(len(vocab) + 1)).astype(np.int64)
+
+    segment = f"segment_{len(meta['segments']):04d}"
+    segment_dir = os.path.join(index_dir, segment)
+    os.makedirs(segment_dir, exist_ok=True)
+    arrays = {
+        "offsets": offsets,
+        "review_ids": token_review[order],
+        "positions": token_position[order],
+        "app_code": app_code,
+        "sentiment_code": sentiment_code,
+        "polarity": polarity,
+        "subjectivity": subjectivity,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(segment_dir, f"{name}.npy"), array)
+
+    meta["segments"].append({"name": segment, "first_review": start, "num_reviews": len(new_df)})
+    meta["num_reviews"] = start + len(new_df)
+
+    # Write the metadata last so a failed build leaves the previous index usable
+    save_meta(meta, index_dir)
+    return len(new_df)
+
+
+class ReviewIndex:
+    def __init__(self, index_dir=INDEX_DIR):
+        self.meta = load_meta(index_dir)
+        self.vocab = self.meta["vocab"]
+        self.apps = self.meta["apps"]
+        self.app_categories = self.meta["app_categories"]
+
+        self.segments = []
+        for segment in self.meta["segments"]:
+            segment_dir = os.path.join(index_dir, segment["name"])
+            self.segments.append({
+                name: np.load(os.path.join(segment_dir, f"{name}.npy"), mmap_mode="r")
+                for name in ["offsets", "review_ids", "positions"]
+            })
+
+        # Review attributes are small enough to keep in memory, indexed by review ID
+        def concat(name):
+            return np.concatenate([np.load(os.path.join(index_dir, s["name"], f"{name}.npy")) for s in self.meta["segments"]]) \
+                if self.meta["segments"] else np.array([])
+
+        self.app_code = concat("app_code")
+        self.sentiment_code = concat("sentiment_code")
+        self.polarity = concat("polarity")
+        self.subjectivity = concat("subjectivity")
+
+    def postings(self, term):
+        # (review_ids, positions) for a single term across all segments
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int32)
+        reviews, positions = [], []
+        for segment in self.segments:
+            if term_id + 1 >= len(segment["offsets"]):
+                continue
+            lo, hi = segment["offsets"][term_id], segment["offsets"][term_id + 1]
+            reviews.append(segment["review_ids"][lo:hi])
+            positions.append(segment["positions"][lo:hi])
+        if not reviews:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int32)
+        return np.concatenate(reviews), np.concatenate(positions)
+
+    def filter_mask(self, review_ids, app=None, category=None, sentiment=None):
+        mask = np.ones(len(review_ids), dtype=bool)
+        codes = self.app_code[review_ids]
+        if app is not None:
+            apps = {app} if isinstance(app, str) else set(app)
+            app_ids = [i for i, name in enumerate(self.apps) if name in apps]
+            mask &= np.isin(codes, app_ids)
+        if category is not None:
+            categories = {category} if isinstance(category, str) else set(category)
+            app_ids = [i for i, name in enumerate(self.apps) if self.app_categories.get(name) in categories]
+            mask &= np.isin(codes, app_ids)
+        if sentiment is not None:
+            sentiments = [sentiment] if isinstance(sentiment, str) else list(sentiment)
+            mask &= np.isin(self.sentiment_code[review_ids], [SENTIMENTS.index(s) for s in sentiments])
+        return mask
+
+    def search(self, query, app=None, category=None, sentiment=None):
+        """Review IDs containing query, treated as a phrase when it has several words."""
+        terms = tokenize(query)
+        if not terms:
+            return np.array([], dtype=np.int64)
+
+        reviews, positions = self.postings(terms[0])
+        # Each following word must appear at the next position in the same review
+        keys = reviews.astype(np.int64) * MAX_POSITIONS + positions
+        for offset, term in enumerate(terms[1:], start=1):
+            next_reviews, next_positions = self.postings(term)
+            next_keys = next_reviews.astype(np.int64) * MAX_POSITIONS + next_positions - offset
+            keys = np.intersect1d(keys, next_keys)
+            if len(keys) == 0:
+                break
+
+        review_ids = np.unique(keys // MAX_POSITIONS)
+        return review_ids[self.filter_mask(review_ids, app, category, sentiment)]
+
+    def term_sentiment(self, queries, app=None, category=None, sentiment=None):
+        """Sentiment counts and mean polarity/subjectivity of the reviews matching each query."""
+        rows = []
+        for query in queries:
+            review_ids = self.search(query, app, category, sentiment)
+            codes = self.sentiment_code[review_ids]
+            row = {"Term": query, "Reviews": len(review_ids)}
+            for i, name in enumerate(SENTIMENTS):
+                row[name] = int((codes == i).sum())
+            row["Mean Polarity"] = float(np.nanmean(self.polarity[review_ids])) if len(review_ids) else np.nan
+            row["Mean Subjectivity"] = float(np.nanmean(self.subjectivity[review_ids])) if len(review_ids) else np.nan
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword drilldowns over Translated_Review text.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Index reviews added since the last build")
+    build_parser.add_argument("reviews_csv", nargs="?", default="googleplaystore_user_reviews.csv")
+    build_parser.add_argument("--apps", default="googleplaystore.csv", help="Apps CSV used for category filters")
+    build_parser.add_argument("--index", default=INDEX_DIR, help="Index directory")
+
+    search_parser = subparsers.add_parser("search", help="Look up keywords or phrases")
+    search_parser.add_argument("queries", nargs="+", help="Keywords or quoted phrases")
+    search_parser.add_argument("--app")
+    search_parser.add_argument("--category")
+    search_parser.add_argument("--sentiment", choices=SENTIMENTS)
+    search_parser.add_argument("--show-ids", action="store_true", help="Print matching review IDs")
+    search_parser.add_argument("--index", default=INDEX_DIR, help="Index directory")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        added = build(args.reviews_csv, args.apps, args.index)
+        print(f"Indexed {added} new reviews")
+    else:
+        index = ReviewIndex(args.index)
+        print(index.term_sentiment(args.queries, args.app, args.category, args.sentiment).to_string(index=False))
+        if args.show_ids:
+            for query in args.queries:
+                print(query, index.search(query, args.app, args.category, args.sentiment).tolist())
+
+
+if __name__ == "__main__":
+    main()
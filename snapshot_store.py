@@ -0,0 +1,264 @@
+import argparse
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from leaderboard import CategoryLeaderboard
+
+# Append-only history of scraped Play Store snapshots, stored as Parquet files
+# partitioned by snapshot date:
+#
+#   snapshots/apps/snapshot_date=2026-10-19/part.parquet
+#   snapshots/reviews/snapshot_date=2026-10-19/part.parquet
+#   snapshots/deltas/snapshot_date=2026-10-19/part.parquet
+#   snapshots/leaderboard/snapshot_date=2026-10-19/leaderboard.csv
+#
+# Ingesting a snapshot only reads the new CSV files and the previous apps
+# partition, and writes the per-app deltas between the two. The category
+# leaderboard of the latest snapshot is updated from those deltas instead of
+# being regrouped from the apps table.
+#
+# The apps partition is written last and marks a snapshot as complete: other
+# partitions of a date without it are leftovers of an interrupted ingest,
+# are ignored by the readers and are overwritten when the date is ingested
+# again.
+
+STORE_DIR = "snapshots"
+PARTITION_PREFIX = "snapshot_date="
+LEADERBOARD_TABLE = "leaderboard"
+LEADERBOARD_FILE = "leaderboard.csv"
+DELTA_FIELDS = ["Category", "Installs", "Reviews", "Rating"]
+
+
+def partition_path(table, snapshot_date, store_dir=STORE_DIR):
+    return os.path.join(store_dir, table, f"{PARTITION_PREFIX}{snapshot_date}", "part.parquet")
+
+
+def list_snapshots(table="apps", store_dir=STORE_DIR):
+    # Snapshot dates come from the directory names, no data files are opened.
+    # Only dates whose apps partition exists are complete snapshots.
+    table_dir = os.path.join(store_dir, table)
+    if not os.path.isdir(table_dir):
+        return []
+    dates = [name[len(PARTITION_PREFIX):] for name in os.listdir(table_dir) if name.startswith(PARTITION_PREFIX)]
+    dates = [d for d in dates if os.path.exists(partition_path(table, d, store_dir))]
+    if table != "apps":
+        dates = [d for d in dates if os.path.exists(partition_path("apps", d, store_dir))]
+    return sorted(dates)
+
+
+def read_snapshots(table="apps", start=None, end=None, columns=None, store_dir=STORE_DIR, dates=None):
+    """Read the partitions of a table whose snapshot date is within [start, end].
+
+    If dates is given, only the partitions of those snapshot dates are read.
+    Partitions outside the range are pruned before any file is read. The
+    snapshot date is added back as a 'Snapshot Date' column.
+    """
+    start = str(pd.Timestamp(start).date()) if start is not None else None
+    end = str(pd.Timestamp(end).date()) if end is not None else None
+    dates = {str(pd.Timestamp(d).date()) for d in dates} if dates is not None else None
+    frames = []
+    for snapshot_date in list_snapshots(table, store_dir):
+        if (start and snapshot_date < start) or (end and snapshot_date > end):
+            continue
+        if dates is not None and snapshot_date not in dates:
+            continue
+        frame = pd.read_parquet(partition_path(table, snapshot_date, store_dir), columns=columns)
+        frame["Snapshot Date"] = pd.Timestamp(snapshot_date)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=(columns or []) + ["Snapshot Date"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_latest(table="apps", columns=None, store_dir=STORE_DIR):
+    snapshots = list_snapshots(table, store_dir)
+    if not snapshots:
+        return None
+    return read_snapshots(table, start=snapshots[-1], end=snapshots[-1], columns=columns, store_dir=store_dir)
+
+
+def clean_apps(apps_df):
+    # Same cleaning the analysis scripts apply, done once at ingestion time
+    apps_df = apps_df.copy()
+    apps_df.columns = apps_df.columns.str.strip()
+    apps_df["Installs"] = pd.to_numeric(apps_df["Installs"].astype(str).str.replace(r"[,\+]", "", regex=True), errors="coerce")
+    apps_df["Reviews"] = pd.to_numeric(apps_df["Reviews"], errors="coerce")
+    apps_df["Rating"] = pd.to_numeric(apps_df["Rating"], errors="coerce")
+    apps_df["Price"] = pd.to_numeric(apps_df["Price"].astype(str).str.replace("$", "", regex=False), errors="coerce")
+    apps_df["Last Updated"] = pd.to_datetime(apps_df["Last Updated"], errors="coerce")
+    for column in apps_df.columns:
+        if apps_df[column].dtype == object:
+            apps_df[column] = apps_df[column].astype(str).where(apps_df[column].notna())
+    return apps_df
+
+
+def one_row_per_app(frame):
+    # Apps listed several times keep their row with the most reviews
+    return frame[["App"] + DELTA_FIELDS].sort_values("Reviews", na_position="first").drop_duplicates("App", keep="last")
+
+
+def compute_deltas(previous_df, current_df):
+    """Per-app changes between two cleaned apps snapshots.
+
+    Apps listed several times keep their row with the most reviews. Apps that
+    are new or were removed get NaN for the side they are missing from.
+    """
+    merged = pd.merge(
+        one_row_per_app(previous_df), one_row_per_app(current_df),
+        on="App", how="outer", suffixes=(" Previous", ""), indicator=True
+    )
+    merged["Status"] = merged["_merge"].map({"both": "existing", "right_only": "new", "left_only": "removed"}).astype(str)
+    removed = merged["Status"] == "removed"
+    merged.loc[removed, "Category"] = merged.loc[removed, "Category Previous"]
+    # Installs that fail to parse on both sides (e.g. 'Free') are not a change
+    merged["Installs Bucket Changed"] = (merged["_merge"] == "both") \
+        & merged["Installs"].ne(merged["Installs Previous"]) \
+        & merged[["Installs", "Installs Previous"]].notna().any(axis=1)
+    merged["New Reviews"] = merged["Reviews"] - merged["Reviews Previous"]
+    merged["Rating Drift"] = merged["Rating"] - merged["Rating Previous"]
+    return merged[[
+        "App", "Category Previous", "Category", "Status",
+        "Installs Previous", "Installs", "Installs Bucket Changed",
+        "Reviews Previous", "Reviews", "New Reviews",
+        "Rating Previous", "Rating", "Rating Drift",
+    ]]
+
+
+def leaderboard_path(snapshot_date, store_dir=STORE_DIR):
+    return os.path.join(store_dir, LEADERBOARD_TABLE, f"{PARTITION_PREFIX}{snapshot_date}", LEADERBOARD_FILE)
+
+
+def load_leaderboard(snapshot_date=None, store_dir=STORE_DIR):
+    """Category leaderboard of a snapshot (the latest by default), or None if there is none."""
+    if snapshot_date is None:
+        snapshots = list_snapshots("apps", store_dir)
+        if not snapshots:
+            return None
+        snapshot_date = snapshots[-1]
+    path = leaderboard_path(snapshot_date, store_dir)
+    return CategoryLeaderboard.load(path) if os.path.exists(path) else None
+
+
+def update_leaderboard(leaderboard, deltas_df):
+    # Only apps that appeared, disappeared or changed are taken out and put back in
+    changed = deltas_df["Status"] != "existing"
+    for field in DELTA_FIELDS:
+        previous, current = deltas_df[f"{field} Previous"], deltas_df[field]
+        changed |= previous.ne(current) & (previous.notna() | current.notna())
+    changed = deltas_df[changed]
+
+    old_rows = changed[changed["Status"] != "new"]
+    old_rows = old_rows[[f"{field} Previous" for field in DELTA_FIELDS]]
+    old_rows.columns = DELTA_FIELDS
+    # Removed apps have their previous category copied into Category, so take the current
+    # side only from apps that are still listed
+    new_rows = changed.loc[changed["Status"] != "removed", DELTA_FIELDS]
+
+    leaderboard.remove(old_rows)
+    leaderboard.add(new_rows)
+    return leaderboard
+
+
+def check_leaderboard(store_dir=STORE_DIR):
+    # The incrementally maintained leaderboard must equal one rebuilt from the latest snapshot
+    leaderboard = load_leaderboard(store_dir=store_dir)
+    if leaderboard is None:
+        raise FileNotFoundError(f"No leaderboard for the latest snapshot in {store_dir}, ingest a snapshot first")
+    latest = pd.read_parquet(partition_path("apps", list_snapshots("apps", store_dir)[-1], store_dir))
+    expected = CategoryLeaderboard.from_apps(one_row_per_app(latest)).table().sort_index()
+    pd.testing.assert_frame_equal(leaderboard.table().sort_index(), expected, check_exact=False)
+
+
+def write_atomic(path, write):
+    # Write to a temporary file and rename it, so a partition is either complete or absent
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def ingest(apps_path, reviews_path=None, snapshot_date=None, store_dir=STORE_DIR):
+    snapshot_date = str(pd.Timestamp(snapshot_date or date.today()).date())
+
+    # The store is append-only: never rewrite an existing partition
+    if os.path.exists(partition_path("apps", snapshot_date, store_dir)):
+        raise FileExistsError(f"Snapshot {snapshot_date} is already in {store_dir}")
+
+    apps_df = clean_apps(pd.read_csv(apps_path))
+
+    # Only the latest earlier partition is needed for the deltas
+    snapshots = list_snapshots("apps", store_dir)
+    previous = [d for d in snapshots if d < snapshot_date]
+    deltas_df = None
+    if previous:
+        previous_df = pd.read_parquet(partition_path("apps", previous[-1], store_dir))
+        deltas_df = compute_deltas(previous_df, apps_df)
+        deltas_df["Previous Snapshot"] = pd.Timestamp(previous[-1])
+
+    # The leaderboard follows the newest snapshot; backfilled older snapshots leave it alone.
+    # It is derived from the previous snapshot's leaderboard, so rerunning an interrupted
+    # ingest recomputes the same table instead of applying the deltas twice.
+    leaderboard = None
+    if not snapshots or snapshot_date > snapshots[-1]:
+        leaderboard = load_leaderboard(previous[-1], store_dir) if deltas_df is not None else None
+        if leaderboard is None:
+            leaderboard = CategoryLeaderboard.from_apps(one_row_per_app(apps_df))
+        else:
+            leaderboard = update_leaderboard(leaderboard, deltas_df)
+
+    outputs = []
+    if reviews_path is not None:
+        reviews_df = pd.read_csv(reviews_path)
+        reviews_df.columns = reviews_df.columns.str.strip()
+        outputs.append(("reviews", reviews_df))
+    if deltas_df is not None:
+        outputs.append(("deltas", deltas_df))
+
+    for table, frame in outputs:
+        write_atomic(partition_path(table, snapshot_date, store_dir), lambda path: frame.to_parquet(path, index=False))
+    if leaderboard is not None:
+        write_atomic(leaderboard_path(snapshot_date, store_dir), leaderboard.save)
+    # Written last: the snapshot only becomes visible once everything else is in place
+    write_atomic(partition_path("apps", snapshot_date, store_dir), lambda path: apps_df.to_parquet(path, index=False))
+
+    return snapshot_date, deltas_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the partitioned Play Store snapshot history.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Add a new snapshot and compute its deltas")
+    ingest_parser.add_argument("apps_csv", help="Path to googleplaystore.csv")
+    ingest_parser.add_argument("reviews_csv", nargs="?", help="Path to googleplaystore_user_reviews.csv")
+    ingest_parser.add_argument("--date", help="Snapshot date (YYYY-MM-DD), defaults to today")
+    ingest_parser.add_argument("--store", default=STORE_DIR, help="Store directory")
+
+    list_parser = subparsers.add_parser("list", help="List stored snapshots")
+    list_parser.add_argument("--store", default=STORE_DIR, help="Store directory")
+
+    check_parser = subparsers.add_parser("check-leaderboard", help="Compare the leaderboard with a full rebuild")
+    check_parser.add_argument("--store", default=STORE_DIR, help="Store directory")
+
+    args = parser.parse_args()
+    if args.command == "ingest":
+        snapshot_date, deltas_df = ingest(args.apps_csv, args.reviews_csv, args.date, args.store)
+        print(f"Stored snapshot {snapshot_date}")
+        if deltas_df is not None:
+            print("New apps:", int((deltas_df["Status"] == "new").sum()))
+            print("Removed apps:", int((deltas_df["Status"] == "removed").sum()))
+            print("Installs bucket changes:", int(deltas_df["Installs Bucket Changed"].sum()))
+            print("New reviews:", int(np.nansum(deltas_df["New Reviews"].clip(lower=0))))
+    elif args.command == "check-leaderboard":
+        check_leaderboard(args.store)
+        print("Leaderboard matches a rebuild from the latest snapshot")
+    else:
+        for snapshot_date in list_snapshots("apps", args.store):
+            print(snapshot_date)
+
+
+if __name__ == "__main__":
+    main()
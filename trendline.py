@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+# Closed-form OLS trendlines used in place of seaborn's regplot, which bootstraps
+# its confidence band with 1000 resamples of the data
+
+try:
+    from scipy import stats
+except ImportError:
+    stats = None
+
+
+def t_critical(dof, level=0.95):
+    # Two-sided Student t value, falling back to the normal value without scipy
+    dof = np.asarray(dof, dtype=float)
+    if stats is not None:
+        return stats.t.ppf(0.5 + level / 2, np.maximum(dof, 1))
+    return np.full(dof.shape, 1.959963984540054 if level == 0.95 else np.nan)
+
+
+def fit_ols(x, y, groups=None, log=False):
+    """Fit y = intercept + slope * x for every group in one vectorized pass.
+
+    With log=True the fit is done on log10(x) and log10(y), dropping
+    non-positive values. Returns one row per group with the sufficient
+    statistics needed to draw the line and its analytic confidence band.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if groups is None:
+        groups = np.zeros(len(x), dtype=int)
+    groups = np.asarray(groups)
+
+    # Drop points that cannot be fitted
+    valid = np.isfinite(x) & np.isfinite(y)
+    if log:
+        valid &= (x > 0) & (y > 0)
+    x, y, groups = x[valid], y[valid], groups[valid]
+    if log:
+        x, y = np.log10(x), np.log10(y)
+
+    codes, uniques = pd.factorize(groups)
+    k = len(uniques)
+
+    # First pass: group sizes and means
+    n = np.bincount(codes, minlength=k).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.bincount(codes, weights=x, minlength=k) / n
+        y_mean = np.bincount(codes, weights=y, minlength=k) / n
+
+    # Second pass on centered values to avoid cancellation with install counts
+    dx = x - x_mean[codes]
+    dy = y - y_mean[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=k)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=k)
+    syy = np.bincount(codes, weights=dy * dy, minlength=k)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        sse = np.maximum(syy - slope * sxy, 0)
+        s2 = np.where(n > 2, sse / (n - 2), np.nan)
+        r2 = np.where(syy > 0, 1 - sse / syy, np.nan)
+
+    return pd.DataFrame({
+        'n': n.astype(int),
+        'slope': slope,
+        'intercept': intercept,
+        'x_mean': x_mean,
+        'sxx': sxx,
+        's2': s2,
+        'r2': r2,
+        'log': log,
+    }, index=pd.Index(uniques, name='Group'))
+
+
+def predict_band(fit, x_grid, level=0.95):
+    """Evaluate a fitted row on x_grid, returning (y, lower, upper)."""
+    x_grid = np.asarray(x_grid, dtype=float)
+    xs = np.log10(x_grid) if fit['log'] else x_grid
+
+    y = fit['intercept'] + fit['slope'] * xs
+    # Standard error of the mean response at each grid point
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se = np.sqrt(fit['s2'] * (1 / fit['n'] + (xs - fit['x_mean']) ** 2 / fit['sxx']))
+    half_width = t_critical(fit['n'] - 2, level) * se
+    lower, upper = y - half_width, y + half_width
+
+    if fit['log']:
+        return 10 ** y, 10 ** lower, 10 ** upper
+    return y, lower, upper
+
+
+def density_downsample(df, x, y, bins=60, per_cell=25, log=True, seed=0):
+    """Keep at most per_cell random points in each cell of a bins x bins grid.
+
+    Sparse regions (outliers) are kept intact while dense clusters are thinned,
+    so the scatter looks the same with far fewer markers.
+    """
+    if df.empty:
+        return df
+
+    xv = df[x].to_numpy(dtype=float)
+    yv = df[y].to_numpy(dtype=float)
+    if log:
+        xv = np.log10(np.clip(xv, 1, None))
+        yv = np.log10(np.clip(yv, 1, None))
+
+    def to_bin(v):
+        lo, hi = np.nanmin(v), np.nanmax(v)
+        if not np.isfinite(lo) or hi == lo:
+            return np.zeros(len(v), dtype=int)
+        return np.clip(((v - lo) / (hi - lo) * bins).astype(int), 0, bins - 1)
+
+    cell = to_bin(xv) * bins + to_bin(yv)
+
+    # Rank points within each cell in random order and keep the first per_cell
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(cell)), cell))
+    sorted_cell = cell[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_cell)) + 1]
+    run_start = np.repeat(starts, np.diff(np.r_[starts, len(cell)]))
+    rank = np.arange(len(cell)) - run_start
+
+    keep = np.zeros(len(cell), dtype=bool)
+    keep[order[rank < per_cell]] = True
+    return df[keep]